@@ -56,4 +56,7 @@ setup(
         'requests',
         'aiohttp'
     ],
+    extras_require={
+        'fast-json': ['orjson'],
+    },
 )
@@ -1,18 +1,1390 @@
 import os
+import re
 import json
+import math
 import time
+import queue
+import atexit
+import gzip
+import codecs
+import random
+import sqlite3
+import hashlib
 import logging
+import logging.handlers
 import datetime
+import itertools
+import multiprocessing
+import multiprocessing.util
+import weakref
+import threading
+import functools
+import collections
+import email.utils
 
 # Connections to the Replicon API are made possible with requests library.
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
 
 # Asynchronous functionality is built using asyncio and aiohttp.
 import asyncio
 import aiohttp
 
+from urllib.parse import urlsplit
+
 # Threading is built using concurrent futures.
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from concurrent.futures import FIRST_COMPLETED
+
+# Faster JSON encoding and decoding is used, when orjson or ujson exist.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class RepliconRateLimitError(Exception):
+    """Raised when the Replicon API limits a call with HTTP 429."""
+
+    def __init__(self, retry_after=None):
+        self.retry_after = retry_after
+        super().__init__(f'Limited. Retry After: {retry_after}.')
+
+
+class RepliconError(Exception):
+    """Raised when a streamed response reports an error."""
+
+    def __init__(self, error, status_code=None):
+        self.error, self.status_code = error, status_code
+        super().__init__(f'Error: {error} Status Code: {status_code}')
+
+
+class JSONCodec:
+    """Encoding to and decoding from JSON bytes, with a faster backend."""
+
+    def __init__(self, backend=None):
+        """Instantiating the codec with orjson, ujson or json."""
+
+        # Faster backends are opted into, as their output can differ.
+        backend = backend or 'json'
+
+        if backend not in ['orjson', 'ujson', 'json']:
+            raise ValueError(f'JSON backend must be orjson, ujson or json.')
+        if backend == 'orjson' and orjson is None:
+            raise ImportError(f'JSON backend orjson is not installed.')
+        if backend == 'ujson' and ujson is None:
+            raise ImportError(f'JSON backend ujson is not installed.')
+
+        self.backend = backend
+
+    def dumps(self, value):
+        """Encoding a value to JSON bytes."""
+        if self.backend == 'orjson':
+            # Keys that are not strings are stringified, as by json.
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        if self.backend == 'ujson':
+            return ujson.dumps(value, ensure_ascii=False).encode('utf-8')
+
+        return json.dumps(value).encode('utf-8')
+
+    def loads(self, data):
+        """Decoding JSON bytes or text to a value."""
+        if self.backend == 'orjson':
+            return orjson.loads(data)
+        if self.backend == 'json':
+            return json.loads(data)
+
+        try:
+            return ujson.loads(data)
+        except ValueError as exception:
+            # Keeping decoding errors consistent, for retry classification.
+            raise json.JSONDecodeError(str(exception), '', 0)
+
+
+class RepliconCircuitOpenError(Exception):
+    """Raised when calls to a failing endpoint are shed by its circuit."""
+
+
+class CircuitBreaker:
+    """Shedding calls to failing endpoints, probing them after a cool-down."""
+
+    closed, opened, half_open = 'closed', 'open', 'half-open'
+
+    def __init__(self, failure_threshold=5, cooldown=30.0, probes=1):
+        """Instantiating circuits, per host and component of connectors."""
+        self.failure_threshold, self.cooldown = failure_threshold, cooldown
+        self.probes, self.circuits = probes, {}
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        # Circuits are per process; other processes get the settings only.
+        state = dict(self.__dict__)
+        del state['lock'], state['circuits']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.circuits, self.lock = {}, threading.Lock()
+
+    @staticmethod
+    def endpoint(connector):
+        """Host and component of a connector."""
+        url = urlsplit(connector)
+        return url.netloc, url.path.rstrip('/').rsplit('/', 1)[-1]
+
+    def state(self, connector):
+        """State of the circuit of the connector."""
+        with self.lock:
+            circuit = self.circuits.get(self.endpoint(connector))
+            return circuit['state'] if circuit else self.closed
+
+    def before_call(self, connector):
+        """Raising when the circuit is open, letting probes through."""
+
+        endpoint = self.endpoint(connector)
+        with self.lock:
+            circuit = self.circuits.setdefault(endpoint, {
+                'state': self.closed, 'failures': 0,
+                'opened': 0.0, 'probing': 0, 'probed': 0.0
+            })
+
+            if circuit['state'] == self.closed:
+                return
+
+            now = time.monotonic()
+            cooled_down = now - circuit['opened'] >= self.cooldown
+            if circuit['state'] == self.opened and cooled_down:
+                circuit['state'], circuit['probing'] = self.half_open, 0
+
+            # Probes not reported back within the cool-down, as when
+            # cancelled or interrupted, are taken as lost.
+            if (circuit['state'] == self.half_open and
+                    now - circuit['probed'] >= self.cooldown):
+                circuit['probing'] = 0
+
+            if (circuit['state'] == self.half_open and
+                    circuit['probing'] < self.probes):
+                circuit['probing'] += 1
+                circuit['probed'] = now
+                return
+
+        host, component = endpoint
+        raise RepliconCircuitOpenError(
+            f'Circuit of {component} at {host} is {circuit["state"]}.')
+
+    def record_success(self, connector):
+        """Closing the circuit of the connector."""
+        with self.lock:
+            circuit = self.circuits.get(self.endpoint(connector))
+            if circuit:
+                circuit['state'], circuit['failures'] = self.closed, 0
+
+    def record_failure(self, connector):
+        """Counting a failure, opening the circuit beyond the threshold."""
+
+        with self.lock:
+            circuit = self.circuits.get(self.endpoint(connector))
+            if not circuit:
+                return
+
+            circuit['failures'] += 1
+            if (circuit['state'] == self.half_open or
+                    circuit['failures'] >= self.failure_threshold):
+                circuit['state'] = self.opened
+                circuit['opened'] = time.monotonic()
+
+
+class LazyJSON:
+    """Deferring JSON serialization of logged values until formatted."""
+
+    __slots__ = ('value', 'encoded')
+
+    def __init__(self, value, encoded=None):
+        self.value, self.encoded = value, encoded
+
+    def __str__(self):
+        if self.encoded is not None:
+            return self.encoded.decode('utf-8')
+
+        return json.dumps(self.value)
+
+
+class JSONRecordStream:
+    """Yielding records under a key of a JSON object, as chunks arrive."""
+
+    def __init__(self, chunks, key='d', compact_after=64 * 1024,
+                 error_key='error'):
+        """Instantiating the stream over an iterable of byte chunks."""
+        self.chunks, self.key, self.error_key = iter(chunks), key, error_key
+        self.compact_after = compact_after
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer, self.position, self.exhausted = '', 0, False
+
+    def fill(self):
+        """Reading the next chunk into the buffer."""
+
+        if self.exhausted:
+            raise json.JSONDecodeError(
+                'Unexpected end of stream', self.buffer, self.position)
+
+        # Discarding consumed text, keeping the buffer small.
+        if self.position > self.compact_after:
+            self.buffer = self.buffer[self.position:]
+            self.position = 0
+
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.exhausted = True
+            self.buffer += self.text_decoder.decode(b'', final=True)
+        else:
+            self.buffer += self.text_decoder.decode(chunk)
+
+    def peek(self):
+        """Next character that is not whitespace, without consuming it."""
+
+        while True:
+            while (self.position < len(self.buffer) and
+                   self.buffer[self.position] in ' \t\n\r'):
+                self.position += 1
+
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+
+            self.fill()
+
+    def expect(self, character):
+        """Consuming the given character."""
+
+        if self.peek() != character:
+            raise json.JSONDecodeError(
+                f'Expecting {character!r}', self.buffer, self.position)
+
+        self.position += 1
+
+    def decode_value(self):
+        """Decoding the next complete JSON value."""
+
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(
+                    self.buffer, self.position)
+            except json.JSONDecodeError:
+                self.fill()
+                continue
+
+            # Numbers and literals at the end of the buffer may continue.
+            if end == len(self.buffer) and not self.exhausted:
+                self.fill()
+                continue
+
+            self.position = end
+            return value
+
+    def __iter__(self):
+        self.expect('{')
+
+        while True:
+            character = self.peek()
+            if character == '}':
+                return
+            if character == ',':
+                self.position += 1
+                continue
+
+            name = self.decode_value()
+            self.expect(':')
+
+            # Errors are raised, as buffered responses return them instead.
+            if name == self.error_key:
+                error = self.decode_value()
+                if error:
+                    raise RepliconError(error, 200)
+                continue
+
+            if name != self.key:
+                self.decode_value()
+                continue
+
+            if self.peek() != '[':
+                yield self.decode_value()
+                continue
+
+            self.position += 1
+            while True:
+                character = self.peek()
+                if character == ']':
+                    self.position += 1
+                    break
+                if character == ',':
+                    self.position += 1
+                    continue
+
+                yield self.decode_value()
+
+
+class StreamedRecords:
+    """Records streamed out of a response, releasing it once done."""
+
+    def __init__(self, response, records):
+        self.response, self.records = response, records
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self.records)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+    def close(self):
+        """Closing the response, returning its connection to the pool."""
+        self.records.close()
+        self.response.close()
+
+    # Responses of streams never iterated are released once collected.
+    __del__ = close
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queueing log records as they are, leaving formatting to listeners."""
+
+    # Values immutable once logged, safe to leave for listeners to format.
+    immutable_types = (str, bytes, int, float, type(None))
+
+    def prepare(self, record):
+        # Callers may change logged values once returned, so they are
+        # snapshot here; only values already encoded are left deferred.
+        if isinstance(record.args, tuple):
+            record.args = tuple(
+                argument if isinstance(argument, self.immutable_types) or (
+                    isinstance(argument, LazyJSON)
+                    and argument.encoded is not None)
+                else str(argument) for argument in record.args)
+
+        return record
+
+
+class TruncatingFormatter(logging.Formatter):
+    """Formatting log records, truncating entries beyond a size in bytes."""
+
+    def __init__(self, fmt=None, datefmt=None, max_bytes=None):
+        super().__init__(fmt, datefmt)
+        self.max_bytes = max_bytes
+
+    def format(self, record):
+        entry = super().format(record)
+        if not self.max_bytes or len(entry) <= self.max_bytes // 4:
+            return entry
+
+        encoded = entry.encode('utf-8')
+        if len(encoded) <= self.max_bytes:
+            return entry
+
+        truncated = encoded[:self.max_bytes].decode('utf-8', 'ignore')
+        return f'{truncated}... [{len(encoded) - self.max_bytes} bytes cut]'
+
+
+class ActivityLogRouter(logging.Handler):
+    """Writing queued activity logs of every handler, off a single thread."""
+
+    def __init__(self):
+        super().__init__()
+        self.file_handlers, self.queue = {}, queue.Queue()
+        self.listener, self.pid = None, None
+
+    def reset_after_fork(self):
+        """Starting afresh in forked processes, which inherit no listener."""
+        if self.pid != os.getpid():
+            self.file_handlers, self.queue = {}, queue.Queue()
+            self.listener, self.pid = None, os.getpid()
+
+    def register(self, name, file_handler):
+        """Writing records of the named logger to its file handler."""
+
+        with self.lock:
+            self.reset_after_fork()
+            self.file_handlers[name] = file_handler
+            if self.listener is None:
+                self.listener = logging.handlers.QueueListener(
+                    self.queue, self)
+                self.listener.start()
+
+    def unregister(self, name, wait=True):
+        """Closing the file handler of a logger, once its records are out."""
+
+        released = threading.Event()
+        record = logging.makeLogRecord({'name': name, 'released': released})
+        with self.lock:
+            self.reset_after_fork()
+            listening = self.listener is not None
+            if listening:
+                self.queue.put(record)
+
+        if not listening:
+            self.handle(record)
+        elif wait:
+            released.wait()
+
+    def emit(self, record):
+        released = getattr(record, 'released', None)
+        if released is None:
+            file_handler = self.file_handlers.get(record.name)
+            if file_handler is not None:
+                file_handler.handle(record)
+            return
+
+        file_handler = self.file_handlers.pop(record.name, None)
+        if file_handler is not None:
+            file_handler.close()
+        released.set()
+
+    def stop(self):
+        """Writing queued records and closing every file handler."""
+
+        with self.lock:
+            listener, self.listener = self.listener, None
+
+        if listener is not None:
+            listener.stop()
+        for name in list(self.file_handlers):
+            self.unregister(name)
+
+
+# Activity logs of every handler are queued to a single listener, and
+# written out at exit.
+log_router = ActivityLogRouter()
+atexit.register(log_router.stop)
+logger_ids = itertools.count()
+
+
+class RateBudget:
+    """Budget of calls, pacing calls by reservations against it."""
+
+    # Implementations, such as one kept by a local stand-in server, only
+    # need to implement reserve, returning 0 once a call can be made.
+
+    # Budgets safe to share with worker processes, as they are.
+    process_safe = False
+
+    # Budgets reserved through blocking I/O, kept off the event loop.
+    blocking = False
+
+    def reserve(self):
+        """Taking a call when available, else the seconds left to wait."""
+        raise NotImplementedError
+
+    def acquire(self):
+        """Blocking the calling thread until a call can be made."""
+        wait = self.reserve()
+        while wait:
+            time.sleep(wait)
+            wait = self.reserve()
+
+    async def async_acquire(self):
+        """Suspending the calling coroutine until a call can be made."""
+
+        loop = asyncio.get_event_loop()
+
+        async def reserve():
+            if self.blocking:
+                return await loop.run_in_executor(None, self.reserve)
+            return self.reserve()
+
+        wait = await reserve()
+        while wait:
+            await asyncio.sleep(wait)
+            wait = await reserve()
+
+
+class RateLimiter(RateBudget):
+    """Pacing calls with token buckets, shared by threads and coroutines."""
+
+    def __init__(self, calls_per_hour=None, calls_per_second=None,
+                 burst=None):
+        """Instantiating the limiter with hourly and/or per second budgets."""
+
+        # Buckets are kept flat as: refill rate, capacity, tokens, refilled.
+        self.state, self.lock = [], threading.Lock()
+
+        if calls_per_hour:
+            # Bursts are carved out of the hour, so it is never exceeded.
+            capacity = min(burst or max(1, calls_per_hour // 60),
+                           calls_per_hour)
+            rate = max(calls_per_hour - capacity, 1) / 3600
+            self.state.extend([rate, capacity, capacity, self.clock()])
+
+        if calls_per_second:
+            capacity = 1
+            rate = calls_per_second
+            self.state.extend([rate, capacity, capacity, self.clock()])
+
+    @staticmethod
+    def clock():
+        """Seconds on the clock buckets are refilled by."""
+        return time.monotonic()
+
+    @staticmethod
+    def take_token(state, now):
+        """Refilling buckets and taking a token from each, if all have one."""
+
+        wait = 0.0
+        for index in range(0, len(state), 4):
+            rate, capacity, tokens, refilled = state[index:index + 4]
+            tokens = min(capacity, tokens + (now - refilled) * rate)
+            state[index + 2], state[index + 3] = tokens, now
+
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) / rate)
+
+        if wait:
+            return wait
+
+        for index in range(2, len(state), 4):
+            state[index] -= 1
+
+        return 0.0
+
+    def reserve(self):
+        with self.lock:
+            return self.take_token(self.state, self.clock())
+
+
+class SharedRateLimiter(RateLimiter):
+    """Pacing calls with token buckets, shared by worker processes."""
+
+    process_safe = True
+
+    def __init__(self, calls_per_hour=None, calls_per_second=None,
+                 burst=None):
+        """Instantiating the limiter in memory shared with child processes."""
+        super().__init__(calls_per_hour, calls_per_second, burst)
+        self.state = multiprocessing.RawArray('d', self.state)
+        self.lock = multiprocessing.Lock()
+
+    @classmethod
+    def from_limiter(cls, limiter):
+        """Sharing the budget of an existing limiter with child processes."""
+        shared = cls()
+        with limiter.lock:
+            shared.state = multiprocessing.RawArray('d', list(limiter.state))
+
+        return shared
+
+
+class AdaptiveConcurrency:
+    """Growing concurrency additively while healthy, halving it otherwise."""
+
+    def __init__(self, initial=4, minimum=1, maximum=64, backoff=0.5,
+                 latency_tolerance=2.0, cooldown=1.0):
+        """Instantiating the controller, within the bounds of concurrency."""
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum, self.maximum = minimum, maximum
+        self.backoff, self.latency_tolerance = backoff, latency_tolerance
+        self.cooldown, self.decreased = cooldown, 0.0
+        self.in_flight, self.baseline = 0, None
+        self.condition = threading.Condition()
+
+    def try_acquire(self):
+        """Taking a slot if one is free under the limit."""
+        with self.condition:
+            if self.in_flight >= int(self.limit):
+                return False
+
+            self.in_flight += 1
+            return True
+
+    def acquire(self):
+        """Blocking the calling thread until a slot is free."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    def release(self):
+        """Freeing a slot."""
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def record(self, latency, overloaded=False):
+        """Adjusting the limit to the latency and outcome of an attempt."""
+
+        with self.condition:
+            baseline = self.baseline
+            spike = baseline is not None and (
+                latency > baseline * self.latency_tolerance)
+            self.baseline = latency if baseline is None else (
+                0.9 * baseline + 0.1 * latency)
+
+            if overloaded or spike:
+                # Backing off at most once per cooldown, for a burst of errors.
+                now = time.monotonic()
+                if now - self.decreased >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self.decreased = now
+            else:
+                # Adding a slot, once per limit worth of healthy attempts.
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+            self.condition.notify_all()
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """Pacing calls with token buckets kept in SQLite, shared by processes."""
+
+    process_safe, blocking = True, True
+
+    def __init__(self, path, name, calls_per_hour=None,
+                 calls_per_second=None, burst=None, timeout=30):
+        """Instantiating the limiter in a database file, under a name."""
+
+        # The database is opened, and created if need be, on first use.
+        super().__init__(calls_per_hour, calls_per_second, burst)
+        self.path, self.name, self.timeout = path, name, timeout
+        self.local = threading.local()
+
+    def create_budget(self, connection):
+        """Creating the budget table, and the buckets of the named budget."""
+
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS budgets ('
+            'name TEXT, bucket INTEGER, rate REAL, capacity REAL, '
+            'tokens REAL, refilled REAL, PRIMARY KEY (name, bucket))')
+
+        # Budgets already in use keep their tokens, taking the new limits.
+        for bucket, index in enumerate(range(0, len(self.state), 4)):
+            rate, capacity, tokens, refilled = self.state[index:index + 4]
+            connection.execute(
+                'INSERT OR IGNORE INTO budgets VALUES (?, ?, ?, ?, ?, ?)',
+                (self.name, bucket, rate, capacity, tokens, refilled))
+            connection.execute(
+                'UPDATE budgets SET rate = ?, capacity = ? '
+                'WHERE name = ? AND bucket = ?',
+                (rate, capacity, self.name, bucket))
+
+    @staticmethod
+    def clock():
+        """Seconds on the wall clock, common to every process."""
+        return time.time()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['local'], state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.local, self.lock = threading.local(), threading.Lock()
+
+    def connection(self):
+        """Connection of the calling thread to the database."""
+
+        # Connections inherited by forked processes are left to the parent.
+        if getattr(self.local, 'pid', None) != os.getpid():
+            self.local.connection, self.local.pid = None, os.getpid()
+
+        connection = self.local.connection
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self.create_budget(connection)
+            self.local.connection = connection
+
+        return connection
+
+    def reserve(self):
+        connection = self.connection()
+
+        # Locking the database for writes, across processes.
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            rows = connection.execute(
+                'SELECT bucket, rate, capacity, tokens, refilled '
+                'FROM budgets WHERE name = ? ORDER BY bucket',
+                (self.name,)).fetchall()
+
+            state = [value for row in rows for value in row[1:]]
+            wait = self.take_token(state, self.clock())
+
+            connection.executemany(
+                'UPDATE budgets SET tokens = ?, refilled = ? '
+                'WHERE name = ? AND bucket = ?',
+                [(state[index * 4 + 2], state[index * 4 + 3],
+                  self.name, row[0]) for index, row in enumerate(rows)])
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+        connection.execute('COMMIT')
+        return wait
+
+
+class TransferStats:
+    """Counting bytes transferred, before and after compression."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.request_bytes = self.request_wire_bytes = 0
+        self.response_bytes = self.response_wire_bytes = 0
+
+    def record_request(self, size, wire_size):
+        """Counting a request body, as serialized and as sent."""
+        with self.lock:
+            self.request_bytes += size
+            self.request_wire_bytes += wire_size
+
+    def record_response(self, size, wire_size):
+        """Counting a response body, as received and as decompressed."""
+        with self.lock:
+            self.response_bytes += size
+            self.response_wire_bytes += wire_size
+
+    def metrics(self):
+        """Byte counts, with the bandwidth saved by compression."""
+        with self.lock:
+            return {
+                'request_bytes': self.request_bytes,
+                'request_wire_bytes': self.request_wire_bytes,
+                'response_bytes': self.response_bytes,
+                'response_wire_bytes': self.response_wire_bytes,
+                'saved_bytes': (
+                    self.request_bytes - self.request_wire_bytes +
+                    self.response_bytes - self.response_wire_bytes)
+            }
+
+
+def prefetch_iterator(iterable, buffer):
+    """Iterating in a background thread, buffering up to the given items."""
+
+    items, stop, done = queue.Queue(buffer), threading.Event(), object()
+
+    def put(item):
+        # Giving up once iteration stops, instead of blocking on a full queue.
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except BaseException as exception:
+            put((done, exception))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item, exception = items.get()
+            if exception is not None:
+                raise exception
+            if item is done:
+                return
+            yield item
+    finally:
+        # The producer exits on its own, once the item in flight is done.
+        stop.set()
+
+
+class SingleFlight:
+    """Sharing one call, and its result, among concurrent identical calls."""
+
+    def __init__(self):
+        self.calls, self.lock = {}, threading.Lock()
+
+    def call(self, key, function, *args):
+        """Calling the function, unless a call with the key is in flight."""
+
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = function(*args)
+        except BaseException as exception:
+            future.set_exception(exception)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+
+        return result
+
+
+class ResponseCache:
+    """Caching results of an allowlist of read-only components."""
+
+    # Caches safe to share with worker processes, as they are.
+    process_safe = False
+
+    def __init__(self, components, ttl=300, ttls=None):
+        """Instantiating the cache, with a default and per component TTLs."""
+        self.components = set(components)
+        self.default_ttl, self.ttls = ttl, dict(ttls or {})
+
+    @staticmethod
+    def component(connector):
+        """Component of a connector, such as GetAllUsers."""
+        return connector.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1]
+
+    def cacheable(self, connector):
+        """Evaluating whether results of the connector can be cached."""
+        return self.component(connector) in self.components
+
+    def ttl(self, connector):
+        """Seconds results of the connector are cached for."""
+        return self.ttls.get(self.component(connector), self.default_ttl)
+
+    @staticmethod
+    def encode(result):
+        """Encoding a result, so callers never share the cached one."""
+        return json.dumps(result).encode('utf-8')
+
+    @staticmethod
+    def decode(encoded):
+        """Decoding a cached result into a fresh one."""
+        return json.loads(encoded)
+
+    def size(self, result):
+        """Approximate size of a result in bytes."""
+        return len(self.encode(result))
+
+    def get(self, key):
+        """Cached result of the key, None if missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key, result, ttl):
+        """Caching the result of the key for ttl seconds."""
+        raise NotImplementedError
+
+
+class MemoryResponseCache(ResponseCache):
+    """Caching results in memory, evicting the least recently used."""
+
+    def __init__(self, components, ttl=300, ttls=None, max_entries=1024,
+                 max_bytes=64 * 1024 * 1024):
+        """Instantiating the cache, bounded by entries and bytes."""
+        super().__init__(components, ttl, ttls)
+        self.max_entries, self.max_bytes = max_entries, max_bytes
+        self.entries, self.total_bytes = collections.OrderedDict(), 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            expires, encoded = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                self.total_bytes -= len(encoded)
+                return None
+
+            self.entries.move_to_end(key)
+
+        return self.decode(encoded)
+
+    def set(self, key, result, ttl):
+        # Results are kept encoded, so changes made by callers stay theirs.
+        encoded = self.encode(result)
+        if self.max_bytes and len(encoded) > self.max_bytes:
+            return
+
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= len(previous[1])
+
+            self.entries[key] = (time.monotonic() + ttl, encoded)
+            self.total_bytes += len(encoded)
+
+            # Evicting least recently used entries beyond the ceilings.
+            while (len(self.entries) > self.max_entries or
+                   self.max_bytes and self.total_bytes > self.max_bytes):
+                evicted = self.entries.popitem(last=False)[1]
+                self.total_bytes -= len(evicted[1])
+
+
+class SQLiteResponseCache(ResponseCache):
+    """Caching results in SQLite, shared by processes on the same host."""
+
+    process_safe = True
+
+    def __init__(self, path, components, ttl=300, ttls=None,
+                 max_bytes=256 * 1024 * 1024, timeout=30):
+        """Instantiating the cache in a database file, in WAL mode."""
+        super().__init__(components, ttl, ttls)
+        self.path, self.max_bytes, self.timeout = path, max_bytes, timeout
+        self.local = threading.local()
+
+        with self.connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, expires REAL, accessed REAL, '
+                'size INTEGER, result BLOB)')
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS responses_accessed '
+                'ON responses (accessed)')
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.local = threading.local()
+
+    def connection(self):
+        """Connection of the calling thread to the database."""
+
+        # Connections inherited by forked processes are left to the parent.
+        if getattr(self.local, 'pid', None) != os.getpid():
+            self.local.connection, self.local.pid = None, os.getpid()
+
+        connection = self.local.connection
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self.local.connection = connection
+
+        return connection
+
+    @staticmethod
+    def hash_key(key):
+        """Hashing keys of tenant, connector and payload."""
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        key, now = self.hash_key(key), time.time()
+
+        with self.connection() as connection:
+            row = connection.execute(
+                'SELECT expires, result FROM responses WHERE key = ?',
+                (key,)).fetchone()
+            if row is None:
+                return None
+
+            if row[0] < now:
+                connection.execute(
+                    'DELETE FROM responses WHERE key = ?', (key,))
+                return None
+
+            connection.execute(
+                'UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+
+        return self.decode(row[1])
+
+    def set(self, key, result, ttl):
+        encoded = self.encode(result)
+        if self.max_bytes and len(encoded) > self.max_bytes:
+            return
+
+        key, now = self.hash_key(key), time.time()
+        with self.connection() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                (key, now + ttl, now, len(encoded), encoded))
+
+            if self.max_bytes:
+                self.evict(connection, now)
+
+    def evict(self, connection, now):
+        """Evicting expired, then least recently used, results over size."""
+
+        connection.execute('DELETE FROM responses WHERE expires < ?', (now,))
+        total = connection.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in connection.execute(
+                'SELECT key, size FROM responses ORDER BY accessed'):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        connection.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+    def close(self):
+        """Closing the connection of the calling thread."""
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+
+class RetryPolicy:
+    """Bounded retries, with exponential backoff and full jitter."""
+
+    retry_exceptions = (
+        requests.ConnectionError, requests.Timeout, json.JSONDecodeError,
+        aiohttp.ClientError, asyncio.TimeoutError
+    )
+    retry_statuses = (500, 502, 503, 504)
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=60.0,
+                 retry_exceptions=None, retry_statuses=None):
+        """Instantiating the policy, overriding the classification if given."""
+        self.max_attempts = max_attempts
+        self.base_delay, self.max_delay = base_delay, max_delay
+
+        if retry_exceptions is not None:
+            self.retry_exceptions = tuple(retry_exceptions)
+        if retry_statuses is not None:
+            self.retry_statuses = tuple(retry_statuses)
+
+    def is_retryable(self, exception=None, status_code=None):
+        """Classifying failures that are worth another attempt."""
+        if exception is not None:
+            return isinstance(exception, self.retry_exceptions)
+
+        return status_code in self.retry_statuses
+
+    def delay(self, attempt):
+        """Seconds to wait after the given number of failed attempts."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def should_retry(self, attempt, exception=None, status_code=None):
+        """Evaluating whether another attempt is to be made."""
+        retryable = self.is_retryable(exception, status_code)
+        return retryable and attempt < self.max_attempts
+
+
+class ProgressTracker:
+    """Tracking bulk operations, reporting metrics at an interval."""
+
+    def __init__(self, callback=None, total=None, interval=1.0):
+        """Instantiating the tracker, reporting to the callback if given."""
+        self.callback, self.total, self.interval = callback, total, interval
+        self.processed, self.errors, self.lock = 0, 0, threading.Lock()
+        self.started = self.reported = time.monotonic()
+
+    def metrics(self):
+        """Counts, throughput, error rate and ETA of the operations so far."""
+
+        elapsed = time.monotonic() - self.started
+        throughput = self.processed / elapsed if elapsed else 0.0
+        error_rate = self.errors / self.processed if self.processed else 0.0
+
+        eta = None
+        if self.total is not None and throughput:
+            eta = max(self.total - self.processed, 0) / throughput
+
+        return {
+            'processed': self.processed, 'errors': self.errors,
+            'total': self.total, 'elapsed': elapsed,
+            'throughput': throughput, 'error_rate': error_rate, 'eta': eta
+        }
+
+    def update(self, error=False):
+        """Counting an operation, reporting once the interval has passed."""
+
+        with self.lock:
+            self.processed += 1
+            self.errors += 1 if error else 0
+
+            now = time.monotonic()
+            if not self.callback or now - self.reported < self.interval:
+                return
+
+            self.reported, metrics = now, self.metrics()
+
+        self.callback(metrics)
+
+    def finish(self):
+        """Reporting the final metrics."""
+        if self.callback:
+            with self.lock:
+                metrics = self.metrics()
+
+            self.callback(metrics)
+
+
+def print_progress(metrics):
+    """Printing progress metrics, for use as a progress callback."""
+
+    total = metrics['total'] if metrics['total'] is not None else '?'
+    eta = f"{metrics['eta']:.0f}s" if metrics['eta'] is not None else '?'
+    print(f"Processed: {metrics['processed']}/{total} "
+          f"Errors: {metrics['errors']} "
+          f"Throughput: {metrics['throughput']:.1f}/s ETA: {eta}")
+
+
+class DiscoveryCache:
+    """Caching tenant details in process and, when given a path, on disk."""
+
+    entries, lock = {}, threading.Lock()
+
+    def __init__(self, path=None, ttl=24 * 60 * 60):
+        """Instantiating the cache, with a directory for the files if any."""
+        self.path, self.ttl = path, ttl
+
+    def file_path(self, company_key):
+        """Path of the cache file for a company key."""
+        name = ''.join(c for c in company_key if c.isalnum() or c in '-_')
+        return os.path.join(self.path, f'{name}.json')
+
+    def get(self, company_key):
+        """Tenant details of a company key, if cached and not expired."""
+
+        with self.lock:
+            entry = self.entries.get(company_key)
+
+        if entry is None and self.path:
+            try:
+                with open(self.file_path(company_key), 'r') as cache_file:
+                    entry = json.load(cache_file)
+                entry = (entry['expires'], tuple(entry['details']))
+            except (OSError, ValueError, KeyError, TypeError):
+                # Missing or unreadable files: Discovering the tenant again.
+                entry = None
+
+        if entry is None or entry[0] < time.time():
+            return None
+
+        with self.lock:
+            self.entries[company_key] = entry
+
+        return entry[1]
+
+    def set(self, company_key, details):
+        """Caching tenant details of a company key."""
+
+        entry = (time.time() + self.ttl, tuple(details))
+        with self.lock:
+            self.entries[company_key] = entry
+
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+            file_path = self.file_path(company_key)
+            temporary_path = f'{file_path}.{os.getpid()}.tmp'
+            with open(temporary_path, 'w') as cache_file:
+                json.dump({'expires': entry[0], 'details': entry[1]},
+                          cache_file)
+            os.replace(temporary_path, file_path)
+
+    def invalidate(self, company_key):
+        """Discarding cached tenant details of a company key."""
+
+        with self.lock:
+            self.entries.pop(company_key, None)
+
+        if self.path:
+            try:
+                os.remove(self.file_path(company_key))
+            except OSError:
+                pass
+
+
+class RepliconGraphQLError(Exception):
+    """Raised when a GraphQL operation responds with errors."""
+
+    def __init__(self, errors, data=None):
+        self.errors, self.data = errors, data
+        messages = '; '.join(str(error.get('message', error))
+                             for error in errors)
+        super().__init__(f'GraphQL Errors: {messages}')
+
+
+def graphql_balanced(text, position):
+    """Position past the bracketed span starting at the given position."""
+
+    closing = {'(': ')', '{': '}', '[': ']'}
+    stack, index = [], position
+    while index < len(text):
+        character = text[index]
+        if character == '"':
+            # Skipping strings, block strings included.
+            if text.startswith('"""', index):
+                index = text.index('"""', index + 3) + 3
+                continue
+            index += 1
+            while text[index] != '"':
+                index += 2 if text[index] == '\\' else 1
+        elif character in closing:
+            stack.append(closing[character])
+        elif stack and character == stack[-1]:
+            stack.pop()
+            if not stack:
+                return index + 1
+
+        index += 1
+
+    raise ValueError(f'Unbalanced GraphQL document at {position}.')
+
+
+def graphql_selection(text, position=0):
+    """Position of the selection set of a definition, -1 if none."""
+
+    # Bracketed arguments and variables, defaults included, are skipped.
+    brackets = re.compile(r'[({]')
+    while True:
+        match = brackets.search(text, position)
+        if match is None:
+            return -1
+        if match.group() == '{':
+            return match.start()
+        position = graphql_balanced(text, match.start())
+
+
+@functools.lru_cache(maxsize=256)
+def parse_graphql_operation(query):
+    """Parsing an operation into its type, variables, fields and fragments."""
+
+    # Stripping comments, leaving hashes inside strings untouched.
+    query = re.sub(r'("""[\s\S]*?"""|"(?:[^"\\]|\\.)*")|#[^\n]*',
+                   lambda match: match.group(1) or '', query)
+
+    # Splitting fragment definitions off the operation.
+    fragments, operation, index = [], None, 0
+    while index < len(query):
+        opening = graphql_selection(query, index)
+        if opening < 0:
+            break
+        end = graphql_balanced(query, opening)
+        definition = query[index:end].strip()
+        if definition.startswith('fragment'):
+            fragments.append(definition)
+        elif operation is None:
+            operation = definition
+        else:
+            raise ValueError('Only a single operation can be batched.')
+        index = end
+
+    if operation is None:
+        raise ValueError('GraphQL document has no operation.')
+
+    opening = graphql_selection(operation)
+    header, body = operation[:opening], operation[opening + 1:-1]
+    operation_type = re.match(r'\s*(\w*)', header).group(1) or 'query'
+
+    variables = []
+    if '(' in header:
+        start = header.index('(')
+        definitions = header[start + 1:graphql_balanced(header, start) - 1]
+        variables = re.findall(
+            r'\$(\w+)\s*:\s*(.+?)\s*(?=,?\s*\$\w+\s*:|,?\s*$)',
+            definitions, re.S)
+
+    # Top level fields as (response key, field text).
+    fields, index = [], 0
+    field_pattern = re.compile(r'\s*,?\s*(?:(\w+)\s*:\s*)?(\w+)')
+    while body[index:].strip(' \t\r\n,'):
+        if body[index:].lstrip(' \t\r\n,').startswith('...'):
+            raise ValueError('Top level fragment spreads cannot be batched.')
+
+        match = field_pattern.match(body, index)
+        alias, name = match.groups()
+        index = match.end()
+        while True:
+            rest = body[index:]
+            stripped = rest.lstrip()
+            index += len(rest) - len(stripped)
+            if stripped[:1] in ['(', '{']:
+                index = graphql_balanced(body, index)
+            elif stripped[:1] == '@':
+                index += re.match(r'@\w+', stripped).end()
+            else:
+                break
+
+        text = body[match.start():index].strip(' \t\r\n,')
+        if alias:
+            text = text.split(':', 1)[1].strip()
+        fields.append((alias or name, text))
+
+    return operation_type, tuple(variables), tuple(fields), tuple(fragments)
+
+
+@functools.lru_cache(maxsize=256)
+def graphql_mutation(query):
+    """Evaluating whether a GraphQL document holds a mutation."""
+
+    # Blanking strings and comments, then finding a mutation definition.
+    query = re.sub(r'"""[\s\S]*?"""|"(?:[^"\\]|\\.)*"|#[^\n]*', '""', query)
+    return re.search(r'(?:^|\})\s*mutation\b', query) is not None
+
+
+def rename_graphql(text, prefix):
+    """Prefixing variables and fragment names, skipping strings."""
+
+    def rename(match):
+        string, variable, fragment = match.groups()
+        if string:
+            return string
+        if variable:
+            return f'${prefix}{variable}'
+        # Inline fragments, as in `... on User`, are not named.
+        if fragment == 'on':
+            return match.group()
+        return f'...{prefix}{fragment}'
+
+    text = re.sub(r'^fragment\s+(\w+)', rf'fragment {prefix}\1', text)
+    return re.sub(
+        r'("""[\s\S]*?"""|"(?:[^"\\]|\\.)*")|\$(\w+)|\.\.\.\s*(\w+)',
+        rename, text)
+
+
+def merge_graphql_operations(queries):
+    """Merging operations into one, aliasing fields and variables by index."""
+
+    merged_type, definitions, selections, fragments = None, [], [], []
+    for index, query in enumerate(queries):
+        operation_type, variables, fields, operation_fragments = \
+            parse_graphql_operation(query)
+
+        if merged_type not in [None, operation_type]:
+            raise ValueError('Operations of a batch must be of one type.')
+        merged_type = operation_type
+
+        # Fragments are prefixed too, as operations may share their names.
+        prefix = f'op{index}_'
+        definitions.extend(f'${prefix}{name}: {definition}'
+                           for name, definition in variables)
+        selections.extend(f'{prefix}{key}: {rename_graphql(text, prefix)}'
+                          for key, text in fields)
+        fragments.extend(rename_graphql(fragment, prefix)
+                         for fragment in operation_fragments)
+
+    header = f'({", ".join(definitions)})' if definitions else ''
+    document = f'{merged_type} Batch{header} {{ {" ".join(selections)} }}'
+
+    return '\n'.join([document] + fragments)
 
 
 class RepliconHandler:
@@ -31,6 +1403,11 @@ class RepliconHandler:
                 notices = f'Check initialization of RepliconHandler.'
                 raise KeyError(f'{message} {notices}')
 
+        # Keeping instantiation variables, to instantiate worker processes.
+        self.init_kwargs = dict(kwargs)
+        if isinstance(kwargs['headers'], dict):
+            self.init_kwargs['headers'] = dict(kwargs['headers'])
+
         # Setting up tenant details.
         if kwargs['company_key']:
             self.company_key = kwargs['company_key']
@@ -41,6 +1418,7 @@ class RepliconHandler:
         if kwargs['username'] and kwargs['password']:
             self.username = kwargs['username']
             self.password = kwargs['password']
+            self.authentication_token = None
         elif kwargs['authentication_token']:
             self.authentication_token = kwargs['authentication_token']
         else:
@@ -69,150 +1447,1182 @@ class RepliconHandler:
 
         # Setting up a path to place operational activity logs in.
         if kwargs['log_path']:
-            log_path = rf"{kwargs['log_path']}\Replicon-Activity-Logs"
-            if not os.path.exists(log_path):
-                os.mkdir(log_path)
-
-            self.log_path = log_path
-            self.log_time = time.strftime('%Y%m%d%H%M%S', time.localtime())
-            self.log_file_name = f'{self.company_key}_log_{self.log_time}.log'
-            self.log_file = rf'{self.log_path}\{self.log_file_name}'
+            self.log_path = rf"{kwargs['log_path']}\Replicon-Activity-Logs"
         else:
-            log_path = rf"{os.getcwd()}\Replicon-Activity-Logs"
-            if not os.path.exists(log_path):
-                os.mkdir(log_path)
+            self.log_path = rf"{os.getcwd()}\Replicon-Activity-Logs"
 
-            self.log_path = log_path
-            self.log_time = time.strftime('%Y%m%d%H%M%S', time.localtime())
-            self.log_file_name = f'{self.company_key}_log_{self.log_time}.log'
-            self.log_file = rf'{self.log_path}\{self.log_file_name}'
+        self.log_time = time.strftime('%Y%m%d%H%M%S', time.localtime())
+        self.log_file_name = f'{self.company_key}_log_{self.log_time}.log'
+        self.log_file = rf'{self.log_path}\{self.log_file_name}'
 
         # Allowing flexibility to set up logging levels manually.
         log_level = 'logger_level'
         manual_level = log_level in kwargs.keys() and kwargs[log_level]
         self.log_level = kwargs[log_level] if manual_level else logging.DEBUG
-
-        # Logger Configuration
-        logging.basicConfig(
-            filemode='w', filename=self.log_file,
-            level=self.log_level, datefmt='%m/%d/%Y %H:%M:%S',
-            format='%(levelname)s %(asctime)s %(message)s'
-        )
+        self.log_max_bytes = kwargs.get('log_max_bytes')
+
+        # Allowing responses to be sampled and log files to be rotated.
+        self.log_sample_rate = kwargs.get('log_sample_rate') or 1
+        self.log_sample_counter = itertools.count()
+        self.log_rotate_bytes = kwargs.get('log_rotate_bytes') or 0
+        self.log_backup_count = kwargs.get('log_backup_count') or 5
+        self._logging_ready, self._setup_lock = False, threading.RLock()
+        self._logging_pid = None
+
+        # Activity is logged through a queue, written by a background thread.
+        # Loggers are not registered with logging, so they are collected
+        # along with the handler.
+        self.logger = logging.Logger(
+            f'{__name__}.{self.company_key}.{next(logger_ids)}',
+            self.log_level)
+        self.logger.propagate = False
+        self.log_release, self.log_file_mode = None, 'w'
+
+        # Setting up the JSON codec for request bodies and responses.
+        self.codec = JSONCodec(kwargs.get('json_backend'))
+
+        # Setting up compression of responses and, if asked, large requests.
+        self.compression = kwargs.get('compression', True)
+        self.compress_requests_above = kwargs.get('compress_requests_above')
+        self.transfer_stats = TransferStats()
+
+        # Setting up connection pooling, shared by every request made.
+        self.pool_connections = kwargs.get('pool_connections') or 10
+        self.pool_maxsize = kwargs.get('pool_maxsize') or 20
+        self.pool_block = bool(kwargs.get('pool_block'))
+        self._session, self._session_lock = None, threading.Lock()
+        self._session_pid = None
+
+        # Bounding connects and reads, so hung calls fail and are retried.
+        # A single number bounds both, as a (connect, read) pair would.
+        self.timeout = kwargs.get('timeout') or (10, 300)
+        connect_timeout, read_timeout = (
+            self.timeout if isinstance(self.timeout, (tuple, list))
+            else (self.timeout, self.timeout))
+        self.async_timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=connect_timeout, sock_read=read_timeout)
+
+        # Setting up client side pacing, to stay within the API limits.
+        if kwargs.get('rate_limiter'):
+            self.rate_limiter = kwargs['rate_limiter']
+        elif kwargs.get('rate_budget_path'):
+            self.rate_limiter = SQLiteRateLimiter(
+                kwargs['rate_budget_path'], self.company_key,
+                kwargs.get('calls_per_hour'), kwargs.get('calls_per_second'))
+        elif kwargs.get('calls_per_hour') or kwargs.get('calls_per_second'):
+            self.rate_limiter = RateLimiter(
+                kwargs.get('calls_per_hour'), kwargs.get('calls_per_second'))
+        else:
+            self.rate_limiter = None
+
+        # Setting up the retry policy, used unless one is given per call.
+        self.retry_policy = kwargs.get('retry_policy') or RetryPolicy()
+
+        # Setting up the cache of read-only component results, if given.
+        self.response_cache = kwargs.get('response_cache')
+
+        # Setting up coalescing of concurrent identical calls to read-only
+        # components; True coalesces the components of the response cache.
+        coalesce = kwargs.get('coalesce') or ()
+        if coalesce is True:
+            if not self.response_cache:
+                raise ValueError(
+                    'coalesce=True needs a response_cache; otherwise, '
+                    'list the read-only components to coalesce.')
+            coalesce = self.response_cache.components
+        self.coalesce = set(coalesce)
+        self.single_flight = SingleFlight()
+
+        # Setting up circuit breaking per endpoint, if asked.
+        circuit_breaker = kwargs.get('circuit_breaker')
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreaker()
+        self.circuit_breaker = circuit_breaker or None
+
+        # Observers of every attempt, told of its latency and any overload.
+        self.attempt_observers = ()
 
         # Setting up Replicon Global Domain.
         self.global_domain = 'https://global.replicon.com'
 
-        # Setting up Replicon Tenant Details.
-        (
-            self.tenant_slug, self.swimlane,
-            self.source_swimlane, self.polaris
-        ) = self.get_application_details()
+        # Setting up the cache of tenant details, to skip discovery calls.
+        self.discovery_cache = DiscoveryCache(
+            kwargs.get('discovery_cache_path'),
+            kwargs.get('discovery_ttl') or 24 * 60 * 60)
+
+        # Setting up Replicon Tenant Details, on first use if lazy.
+        self._application_details = None
+        self.discovery_cached = False
+        self.discovery_refresh = bool(kwargs.get('discovery_refresh'))
+        self._discovery_lock = threading.Lock()
+
+        if not kwargs.get('lazy'):
+            self.setup_logging()
+            self.resolve_application_details(self.discovery_refresh)
+
+    def setup_logging(self):
+        """Creating the log directory and configuring logging, once."""
+
+        # Handlers forked along with a process log through its listener.
+        if self._logging_ready and self._logging_pid == os.getpid():
+            return
+
+        with self._setup_lock:
+            if self._logging_ready:
+                if self._logging_pid == os.getpid():
+                    return
+
+                self.log_release.detach()
+                for handler in list(self.logger.handlers):
+                    self.logger.removeHandler(handler)
+
+            if not os.path.exists(self.log_path):
+                os.mkdir(self.log_path)
+
+            # Logger Configuration
+            if self.log_rotate_bytes:
+                file_handler = logging.handlers.RotatingFileHandler(
+                    self.log_file, mode=self.log_file_mode,
+                    maxBytes=self.log_rotate_bytes,
+                    backupCount=self.log_backup_count)
+            else:
+                file_handler = logging.FileHandler(
+                    self.log_file, mode=self.log_file_mode)
+            file_handler.setFormatter(TruncatingFormatter(
+                fmt='%(levelname)s %(asctime)s %(message)s',
+                datefmt='%m/%d/%Y %H:%M:%S', max_bytes=self.log_max_bytes))
+
+            # Files of handlers collected without being closed are released.
+            log_router.register(self.logger.name, file_handler)
+            self.logger.addHandler(DeferredQueueHandler(log_router.queue))
+            self.log_release = weakref.finalize(
+                self, log_router.unregister, self.logger.name, False)
+            self.log_release.atexit = False
+
+            # Logging set up again, after being stopped, appends to the file.
+            self._logging_ready, self.log_file_mode = True, 'a'
+            self._logging_pid = os.getpid()
+
+    def stop_logging(self):
+        """Flushing queued activity logs and closing the log file."""
+
+        with self._setup_lock:
+            release, self.log_release = self.log_release, None
+            if release is None:
+                return
+
+            for handler in list(self.logger.handlers):
+                self.logger.removeHandler(handler)
+            release.detach()
+            log_router.unregister(self.logger.name)
+
+            self._logging_ready = False
+
+    @property
+    def application_details(self):
+        """Tenant details, resolved on first use."""
+
+        if self._application_details is None:
+            with self._setup_lock:
+                if self._application_details is None:
+                    self.setup_logging()
+                    self.resolve_application_details(self.discovery_refresh)
+
+        return self._application_details
+
+    @property
+    def tenant_slug(self):
+        """Replicon Tenant Slug."""
+        return self.application_details[0]
+
+    @property
+    def swimlane(self):
+        """Replicon Tenant Swimlane."""
+        return self.application_details[1]
+
+    @property
+    def source_swimlane(self):
+        """Replicon Tenant Source Swimlane."""
+        return self.application_details[2]
+
+    @property
+    def polaris(self):
+        """Replicon Tenant Polaris URL."""
+        return self.application_details[3]
+
+    def __enter__(self):
+        """Allowing the handler to be used as a context manager."""
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        """Releasing pooled connections on leaving the context."""
+        self.close()
+
+    @property
+    def session(self):
+        """Pooled HTTP session, created on first use and reused after."""
+        # Pooled sockets are not shared with forked processes.
+        if self._session is None or self._session_pid != os.getpid():
+            with self._session_lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    self._session = self.create_session()
+                    self._session_pid = os.getpid()
+
+        return self._session
+
+    def create_session(self):
+        """Creating a keep-alive session with a per host connection pool."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize, pool_block=self.pool_block)
+
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Connection'] = 'keep-alive'
+
+        # Negotiating every encoding urllib3 can decode, gzip and br included.
+        accept_encoding = 'identity'
+        if self.compression:
+            encodings = make_headers(accept_encoding=True)
+            accept_encoding = encodings['accept-encoding']
+
+        session.headers['Accept-Encoding'] = accept_encoding
+
+        return session
+
+    def close(self):
+        """Closing the pooled session and its open connections."""
+        with self._session_lock:
+            session, self._session = self._session, None
+
+        if session is not None:
+            session.close()
+
+        self.stop_logging()
 
     @staticmethod
-    def post_request(connector, headers, payload, auth):
-        """Handling Post Requests related to Replicon API."""
+    def check_rate_limit(status_code, headers):
+        """Raising on API Limits, with the delay asked for by Replicon."""
+
+        if status_code != 429:
+            return
+
+        retry_after = headers.get('Retry-After')
+        if retry_after is None:
+            raise RepliconRateLimitError()
+
+        if retry_after.strip().isdigit():
+            raise RepliconRateLimitError(int(retry_after))
+
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+            delay = retry_at - datetime.datetime.now(datetime.timezone.utc)
+        except (TypeError, ValueError):
+            raise RepliconRateLimitError()
+
+        raise RepliconRateLimitError(max(0, int(delay.total_seconds())))
 
-        log_payload, url_caller = json.dumps(payload), requests.post(
-            url=connector, headers=headers, data=json.dumps(payload), auth=auth)
+    def prepare_body(self, payload, headers):
+        """Serializing request bodies, compressing large ones if asked."""
 
-        status_code = url_caller.status_code
-        correlation_id = url_caller.headers['x-execution-correlation-id']
-        logging.debug(f'Correlation ID: {correlation_id}')
+        body = self.codec.dumps(payload)
+        threshold = self.compress_requests_above
+        if threshold is None or len(body) < threshold:
+            self.transfer_stats.record_request(len(body), len(body))
+            return body, body, headers
 
-        result = url_caller.json()
-        error_in_result = result.get('error')
-        log_message = f'Payload: {log_payload} Response: {result}'
+        wire_body = gzip.compress(body)
+        self.transfer_stats.record_request(len(body), len(wire_body))
+        return body, wire_body, dict(headers, **{'Content-Encoding': 'gzip'})
+
+    def process_response(self, payload, url_caller, body=None):
+        """Evaluating responses of the Replicon API."""
+        self.setup_logging()
+        self.check_rate_limit(url_caller.status_code, url_caller.headers)
+
+        # Bytes read off the wire, before urllib3 decompressed them.
+        content = url_caller.content
+        try:
+            wire_size = url_caller.raw.tell() or len(content)
+        except AttributeError:
+            wire_size = len(content)
+        self.transfer_stats.record_response(len(content), wire_size)
+
+        return self.evaluate_response(
+            payload, url_caller.status_code, url_caller.headers,
+            self.codec.loads(content), body, content)
+
+    def evaluate_response(self, payload, status_code, headers, result,
+                          body=None, content=None):
+        """Logging and splitting errors out of Replicon API results."""
+
+        # Errors are flagged, so callers such as caches can tell them apart.
+        error_in_result = result.get('error') if isinstance(
+            result, dict) else None
+
+        # Successful calls are sampled, errors are always logged.
+        sampled = next(self.log_sample_counter) % self.log_sample_rate == 0
+        if not (error_in_result or sampled):
+            return status_code, result, False
+
+        correlation_id = headers.get('x-execution-correlation-id')
+        self.logger.debug('Correlation ID: %s', correlation_id)
+
+        # Formatting is deferred to the log listener, and skipped if disabled.
+        # Bodies as sent and received are logged, unchanged by callers.
+        log_message = 'Payload: %s Response: %s'
+        log_payload = LazyJSON(payload, body)
+        log_result = LazyJSON(result, content)
 
         if error_in_result:
-            logging.error(log_message)
-            return status_code, error_in_result
+            self.logger.error(log_message, log_payload, log_result)
+            return status_code, error_in_result, True
 
-        logging.info(log_message)
-        return status_code, result
+        self.logger.info(log_message, log_payload, log_result)
+        return status_code, result, False
 
-    @staticmethod
-    def get_request(connector, headers, payload, auth):
+    def post_request(self, connector, headers, payload, auth):
+        """Handling Post Requests related to Replicon API."""
+
+        # Serializing once, for the request as well as the activity logs.
+        body, wire_body, headers = self.prepare_body(payload, headers)
+        url_caller = self.session.post(
+            url=connector, headers=headers, data=wire_body, auth=auth,
+            timeout=self.timeout)
+
+        return self.process_response(payload, url_caller, body)
+
+    def get_request(self, connector, headers, payload, auth):
         """Handling Get Requests related to Replicon API."""
 
-        log_payload, url_caller = json.dumps(payload), requests.get(
-            url=connector, headers=headers, params=payload, auth=auth)
+        url_caller = self.session.get(
+            url=connector, headers=headers, params=payload, auth=auth,
+            timeout=self.timeout)
 
-        status_code = url_caller.status_code
-        correlation_id = url_caller.headers['x-execution-correlation-id']
-        logging.debug(f'Correlation ID: {correlation_id}')
+        return self.process_response(payload, url_caller)
 
-        result = url_caller.json()
-        error_in_result = result.get('error')
-        log_message = f'Payload: {log_payload} Response: {result}'
+    def stream_request(self, connector, headers, payload, auth, method=None):
+        """Handling requests with records streamed out of the response."""
 
-        if error_in_result:
-            logging.error(log_message)
-            return status_code, error_in_result
+        method = method or self.method
+        body = wire_body = params = None
+        if method == 'post':
+            body, wire_body, headers = self.prepare_body(payload, headers)
+        else:
+            params = payload
+
+        url_caller = self.session.request(
+            method, url=connector, headers=headers, data=wire_body,
+            params=params, auth=auth, stream=True, timeout=self.timeout)
 
-        logging.info(log_message)
-        return status_code, error_in_result
+        # Errors are read in full, evaluated as any other response.
+        if url_caller.status_code != 200:
+            with url_caller:
+                return self.process_response(payload, url_caller, body)
+
+        self.setup_logging()
+        self.logger.info('Payload: %s Response: Streamed',
+                         LazyJSON(payload, body))
+
+        def records():
+            try:
+                yield from JSONRecordStream(
+                    url_caller.iter_content(chunk_size=64 * 1024))
+            except RepliconError as exception:
+                self.logger.error('Payload: %s Response: %s',
+                                  LazyJSON(payload, body),
+                                  LazyJSON(exception.error))
+                raise
+
+        return (url_caller.status_code,
+                StreamedRecords(url_caller, records()), False)
+
+    def authentication(self):
+        """Basic authentication details, when a token is not in use."""
+        if self.authentication_token:
+            return None
+
+        return rf'{self.company_key}\{self.username}', self.password
 
     @staticmethod
     def till_next_hour(now):
         """Evaluating time delta between now and the next hour."""
         return (60 * 60) - (now.minute * 60 + now.second)
 
-    def connection_handler(self, connector, payload):
-        """Handling connections, exceptions and API Limitations."""
+    def rate_limit_delay(self, limited):
+        """Seconds a limited operation waits, before being attempted again."""
+        if limited.retry_after is not None:
+            return limited.retry_after
 
-        log_payload = json.dumps(payload)
-        method, headers = self.method, self.headers
-        authentication = None if self.authentication_token else (
-            rf'{self.company_key}\{self.username}', self.password
-        )
+        return self.till_next_hour(datetime.datetime.now())
 
-        try:
-            if method == 'post':
-                status_code, result = self.post_request(
-                    connector, headers, payload, authentication)
-                if status_code == 429:
-                    # API Limits: Initiating the operation in the next hour.
-                    logging.error(f'Limited. Status Code: {status_code}.')
-                    time.sleep(self.till_next_hour(datetime.datetime.now()))
-                    return self.connection_handler(connector, payload)
+    def add_attempt_observer(self, observer):
+        """Calling the observer with the latency and overload of attempts."""
+        self.attempt_observers = self.attempt_observers + (observer,)
+
+    def remove_attempt_observer(self, observer):
+        """No longer calling the observer on attempts."""
+        self.attempt_observers = tuple(
+            existing for existing in self.attempt_observers
+            if existing != observer)
+
+    def observe_attempt(self, started, overloaded=False, connector=None,
+                        failed=False):
+        """Telling observers and circuits of the outcome of an attempt."""
+
+        latency = time.monotonic() - started
+        for observer in self.attempt_observers:
+            observer(latency, overloaded)
+
+        if self.circuit_breaker and connector:
+            if failed:
+                self.circuit_breaker.record_failure(connector)
             else:
-                status_code, result = self.get_request(
+                self.circuit_breaker.record_success(connector)
+
+    def request_key(self, connector, payload, method=None):
+        """Identifying a call by method, connector and canonical payload."""
+        canonical_payload = json.dumps(
+            payload, sort_keys=True, separators=(',', ':'))
+        return (f'{self.company_key} {method or self.method} {connector} '
+                f'{canonical_payload}')
+
+    def connection_handler(self, connector, payload, retry_policy=None,
+                           stream=False, method=None, mutation=False):
+        """Handling connections, exceptions and API Limitations."""
+
+        # Mutations, such as GraphQL ones, are neither cached nor coalesced.
+        read_only = not (stream or mutation)
+
+        # Results of read-only components are served from the cache.
+        cache = self.response_cache
+        if cache and read_only and cache.cacheable(connector):
+            result = cache.get(self.request_key(connector, payload, method))
+            if result is not None:
+                return result
+
+        # Identical calls in flight to read-only components share one call.
+        if (self.coalesce and read_only and
+                ResponseCache.component(connector) in self.coalesce):
+            return self.single_flight.call(
+                self.request_key(connector, payload, method), self.dispatch,
+                connector, payload, retry_policy, False, method)
+
+        return self.dispatch(connector, payload, retry_policy, stream, method)
+
+    def dispatch(self, connector, payload, retry_policy=None, stream=False,
+                 method=None):
+        """Making calls, handling exceptions and API Limitations."""
+        self.setup_logging()
+
+        log_payload = LazyJSON(payload)
+        method, headers = method or self.method, self.headers
+        authentication = self.authentication()
+        request = self.post_request if method == 'post' else self.get_request
+
+        # Streaming: Records of the response are yielded as they are parsed.
+        if stream:
+            request = functools.partial(self.stream_request, method=method)
+        retry_policy, attempt = retry_policy or self.retry_policy, 0
+
+        while True:
+            # Open circuits shed the call, instead of attempting it.
+            if self.circuit_breaker:
+                self.circuit_breaker.before_call(connector)
+
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            started = time.monotonic()
+            try:
+                status_code, result, failed = request(
                     connector, headers, payload, authentication)
-                if status_code == 429:
-                    # API Limits: Initiating the operation in the next hour.
-                    logging.error(f'Limited. Status Code: {status_code}.')
-                    time.sleep(self.till_next_hour(datetime.datetime.now()))
-                    return self.connection_handler(connector, payload)
-
-        except Exception as exception:
-            exception_type = exception.__class__.__name__
-            exception_message = f'Exception: {exception_type} {exception}'
-            logging.error(f'Payload: {log_payload} {exception_message}')
-
-            # Attempting the failed operation again.
-            print(f'Exception: {exception_type}. Retrying in a moment.')
-            time.sleep(20)
-            return self.connection_handler(connector, payload)
 
-        return result
+            except RepliconRateLimitError as limited:
+                # API Limits: Only the limited operation waits it out.
+                self.observe_attempt(started, True, connector)
+                self.logger.error(f'{limited} Status Code: 429.')
+                time.sleep(self.rate_limit_delay(limited))
+                continue
+
+            except Exception as exception:
+                self.observe_attempt(
+                    started, True, connector, failed=True)
+                exception_type = exception.__class__.__name__
+                exception_message = f'Exception: {exception_type} {exception}'
+                self.logger.error(
+                    'Payload: %s %s', log_payload, exception_message)
+
+                attempt += 1
+                if not retry_policy.should_retry(attempt, exception):
+                    raise
+
+                connector = self.refresh_connector(connector, exception)
+
+                # Attempting the failed operation again.
+                self.logger.warning(f'Exception: {exception_type}. Retrying.')
+                time.sleep(retry_policy.delay(attempt))
+                continue
+
+            overloaded = retry_policy.is_retryable(status_code=status_code)
+            self.observe_attempt(
+                started, overloaded, connector, failed=overloaded)
+
+            if overloaded:
+                self.logger.error(
+                    'Payload: %s Status: %s', log_payload, status_code)
+
+                attempt += 1
+                if retry_policy.should_retry(attempt, status_code=status_code):
+                    time.sleep(retry_policy.delay(attempt))
+                    continue
+
+            # Streams return records or raise, never an error in their place.
+            if stream and not isinstance(result, StreamedRecords):
+                raise RepliconError(result, status_code)
+
+            cache = self.response_cache
+            if (cache and not stream and status_code == 200 and
+                    not failed and cache.cacheable(connector)):
+                cache.set(self.request_key(connector, payload, method),
+                          result, cache.ttl(connector))
+
+            return result
 
-    def threaded_handler(self, connector, payloads, workers):
+    @staticmethod
+    def progress_tracker(progress, payloads, interval):
+        """Tracking progress with the given tracker or callback."""
+        if isinstance(progress, ProgressTracker):
+            return progress
+
+        total = len(payloads) if hasattr(payloads, '__len__') else None
+        return ProgressTracker(progress, total, interval)
+
+    @staticmethod
+    def adaptive_concurrency(adaptive, maximum):
+        """Adapting concurrency with the given controller, or a new one."""
+        if not adaptive:
+            return None
+        if isinstance(adaptive, AdaptiveConcurrency):
+            return adaptive
+
+        return AdaptiveConcurrency(initial=min(4, maximum), maximum=maximum)
+
+    def threaded_handler(self, connector, payloads, workers,
+                         retry_policy=None, progress=None,
+                         progress_interval=1.0, return_exceptions=False,
+                         adaptive=None):
         """Handling connections asynchronously for faster execution."""
 
-        counter, results = 0, []
+        return [result for payload, result in self.threaded_iterator(
+            connector, payloads, workers, retry_policy=retry_policy,
+            progress=progress, progress_interval=progress_interval,
+            return_exceptions=return_exceptions, adaptive=adaptive)]
+
+    def threaded_iterator(self, connector, payloads, workers, window=None,
+                          ordered=False, retry_policy=None, progress=None,
+                          progress_interval=1.0, return_exceptions=False,
+                          adaptive=None):
+        """Yielding payloads with their results, as connections complete."""
+
+        tracker = self.progress_tracker(progress, payloads, progress_interval)
+
+        # Adaptive concurrency: Workers are a ceiling, slots are adapted.
+        controller = self.adaptive_concurrency(adaptive, workers)
+
+        def handle(payload):
+            if controller is None:
+                return self.connection_handler(
+                    connector, payload, retry_policy)
+
+            controller.acquire()
+            try:
+                return self.connection_handler(
+                    connector, payload, retry_policy)
+            finally:
+                controller.release()
+
+        # Bounding in-flight operations, instead of submitting all up front.
+        payloads, window = iter(payloads), window or workers * 2
+
+        def outcome(future):
+            try:
+                result = future.result()
+            except Exception as exception:
+                tracker.update(error=True)
+                if not return_exceptions:
+                    raise
+                return exception
+
+            tracker.update()
+            return result
+
+        if controller is not None:
+            self.add_attempt_observer(controller.record)
 
         with ThreadPoolExecutor(max_workers=workers) as threaded_executor:
-            executor = {threaded_executor.submit(
-                self.connection_handler, connector, payload
-            ): payload for payload in payloads}
+            def submit(count):
+                return [(threaded_executor.submit(handle, payload), payload)
+                        for payload in itertools.islice(payloads, count)]
+
+            if ordered:
+                in_flight = collections.deque(submit(window))
+                try:
+                    while in_flight:
+                        future, payload = in_flight.popleft()
+                        result = outcome(future)
+                        in_flight.extend(submit(1))
+                        yield payload, result
+                finally:
+                    for future, payload in in_flight:
+                        future.cancel()
+                    tracker.finish()
+                    if controller is not None:
+                        self.remove_attempt_observer(controller.record)
+                return
+
+            in_flight = dict(submit(window))
+            try:
+                while in_flight:
+                    done = wait(in_flight, return_when=FIRST_COMPLETED).done
+                    for future in done:
+                        payload = in_flight.pop(future)
+                        result = outcome(future)
+                        in_flight.update(submit(1))
+                        yield payload, result
+            finally:
+                for future in in_flight:
+                    future.cancel()
+                tracker.finish()
+                if controller is not None:
+                    self.remove_attempt_observer(controller.record)
 
-            for result in as_completed(executor):
-                counter += 1
-                print(f'Current Processed Entry: {counter}')
-                results.append(result.result())
+    @staticmethod
+    def split_batch(result, payloads):
+        """Results of a bulk call, one per payload of the batch."""
+
+        # Errors of the bulk call are the result of every payload in it.
+        if not isinstance(result, dict) or 'd' not in result:
+            return [result] * len(payloads)
+
+        records = result['d'] or []
+        if len(records) != len(payloads):
+            raise ValueError(
+                f'Bulk call returned {len(records)} results '
+                f'for {len(payloads)} payloads.')
+
+        return list(records)
+
+    def batch_handler(self, connector, payloads, batch_size, workers,
+                      combine, split=None, retry_policy=None, progress=None,
+                      progress_interval=1.0):
+        """Handling payloads in bulk calls, returning results per payload."""
+
+        split = split or self.split_batch
+        payload_iterator, batches = iter(payloads), collections.deque()
+
+        # Batches are kept in order of submission, to split results back.
+        def bulk_payloads():
+            batch = list(itertools.islice(payload_iterator, batch_size))
+            while batch:
+                batches.append(batch)
+                yield combine(batch)
+                batch = list(itertools.islice(payload_iterator, batch_size))
+
+        results = []
+        for bulk_payload, result in self.threaded_iterator(
+                connector, bulk_payloads(), workers, ordered=True,
+                retry_policy=retry_policy, progress=progress,
+                progress_interval=progress_interval):
+            results.extend(split(result, batches.popleft()))
 
         return results
 
+    def paginate(self, connector, payload, page_key='page', size=None,
+                 size_key='pageSize', prefetch=0, first_page=1,
+                 records_key='d', retry_policy=None):
+        """Yielding records of paged calls, until a page comes up short."""
+
+        def page_payloads():
+            for page in itertools.count(first_page):
+                paged_payload = dict(payload)
+                paged_payload[page_key] = page
+                if size:
+                    paged_payload[size_key] = size
+                yield paged_payload
+
+        if prefetch:
+            # Fetching the next pages concurrently, in order of the pages.
+            pages = self.threaded_iterator(
+                connector, page_payloads(), prefetch + 1, window=prefetch + 1,
+                ordered=True, retry_policy=retry_policy)
+        else:
+            pages = ((paged_payload, self.connection_handler(
+                connector, paged_payload, retry_policy
+            )) for paged_payload in page_payloads())
+
+        try:
+            for paged_payload, result in pages:
+                if records_key not in result:
+                    page = paged_payload[page_key]
+                    raise KeyError(
+                        f'Page {page} has no {records_key}: {result}')
+
+                records = result[records_key] or []
+                yield from records
+
+                # Empty pages, and short pages when sized, are the last ones.
+                if not records or (size and len(records) < size):
+                    return
+        finally:
+            pages.close()
+
+    def paginate_parallel(self, connector, payload, size, workers,
+                          count_connector=None, count_payload=None,
+                          count_key='d', total=None, page_key='page',
+                          size_key='pageSize', first_page=1, records_key='d',
+                          retry_policy=None):
+        """Yielding records of paged calls, fetching known pages at once."""
+
+        # Counting records, unless the total is already known.
+        if total is None:
+            if count_connector is None:
+                raise ValueError(
+                    'Either count_connector or total must be specified.')
+
+            count_result = self.connection_handler(
+                count_connector,
+                payload if count_payload is None else count_payload,
+                retry_policy)
+            total = int(count_result[count_key])
+
+        def page_payloads():
+            pages = math.ceil(total / size)
+            for page in range(first_page, first_page + pages):
+                paged_payload = dict(payload)
+                paged_payload[page_key], paged_payload[size_key] = page, size
+                yield paged_payload
+
+        # Pages in flight are bounded, records are yielded in page order.
+        pages = self.threaded_iterator(
+            connector, page_payloads(), workers, ordered=True,
+            retry_policy=retry_policy)
+
+        try:
+            for paged_payload, result in pages:
+                if records_key not in result:
+                    page = paged_payload[page_key]
+                    raise KeyError(
+                        f'Page {page} has no {records_key}: {result}')
+
+                yield from result[records_key] or []
+        finally:
+            pages.close()
+
+    def graphql_execute(self, query, variables=None, operation_name=None,
+                        retry_policy=None):
+        """Executing a GraphQL operation, raising its errors."""
+
+        payload = {'query': query, 'variables': variables or {}}
+        if operation_name:
+            payload['operationName'] = operation_name
+
+        # GraphQL is always posted, whatever the method of the handler.
+        result = self.connection_handler(
+            self.graphql(), payload, retry_policy, method='post',
+            mutation=graphql_mutation(query))
+        if not isinstance(result, dict):
+            raise RepliconGraphQLError([{'message': result}])
+        if result.get('errors'):
+            raise RepliconGraphQLError(result['errors'], result.get('data'))
+
+        return result.get('data')
+
+    def graphql_batch(self, operations, mode='alias', retry_policy=None):
+        """Executing GraphQL operations in one call, split per operation."""
+
+        # Operations are queries, or pairs of queries and variables.
+        operations = [(operation, {}) if isinstance(operation, str)
+                      else (operation[0], operation[1] or {})
+                      for operation in operations]
+        if not operations:
+            return []
+
+        if mode == 'array':
+            # Servers supporting batches respond with a list of results.
+            results = self.connection_handler(
+                self.graphql(), [{'query': query, 'variables': variables}
+                                 for query, variables in operations],
+                retry_policy, method='post', mutation=any(
+                    graphql_mutation(query) for query, _ in operations))
+            if not isinstance(results, list):
+                raise RepliconGraphQLError([{'message': results}])
+
+            return [{'data': result.get('data'),
+                     'errors': result.get('errors') or []}
+                    for result in results]
+
+        if mode != 'alias':
+            raise ValueError(f'Unknown GraphQL batch mode: {mode}')
+
+        # Merging operations, fields and variables prefixed by the index.
+        query = merge_graphql_operations(
+            tuple(query for query, _ in operations))
+        merged_variables = {
+            f'op{index}_{name}': value
+            for index, (_, variables) in enumerate(operations)
+            for name, value in variables.items()}
+
+        result = self.connection_handler(
+            self.graphql(), {'query': query, 'variables': merged_variables},
+            retry_policy, method='post', mutation=graphql_mutation(query))
+        if not isinstance(result, dict):
+            raise RepliconGraphQLError([{'message': result}])
+
+        results = [{'data': {}, 'errors': []} for _ in operations]
+        for alias, value in (result.get('data') or {}).items():
+            prefix, key = alias.split('_', 1)
+            results[int(prefix[2:])]['data'][key] = value
+
+        # Errors are attributed by their path, or to every operation.
+        for error in result.get('errors') or []:
+            path = error.get('path') or ['']
+            prefix, _, key = str(path[0]).partition('_')
+            if prefix[2:].isdigit() and int(prefix[2:]) < len(results):
+                results[int(prefix[2:])]['errors'].append(
+                    dict(error, path=[key] + list(path[1:])))
+            else:
+                for operation_result in results:
+                    operation_result['errors'].append(error)
+
+        for operation_result in results:
+            if not operation_result['data']:
+                operation_result['data'] = None
+
+        return results
+
+    def graphql_connection(self, query, path, variables=None,
+                           cursor_variable='after', prefetch=0,
+                           retry_policy=None):
+        """Yielding nodes of a GraphQL connection, following its cursors."""
+
+        def connection_pages():
+            paged_variables = dict(variables or {})
+            while True:
+                connection = self.graphql_execute(
+                    query, paged_variables, retry_policy=retry_policy)
+                for key in path:
+                    connection = connection[key]
+                yield connection
+
+                page_info = connection.get('pageInfo') or {}
+                if not page_info.get('hasNextPage'):
+                    return
+                paged_variables[cursor_variable] = page_info['endCursor']
+
+        # Cursors are serial; next pages are fetched in the background.
+        pages = connection_pages()
+        if prefetch:
+            pages = prefetch_iterator(pages, prefetch)
+
+        try:
+            for connection in pages:
+                # Connections list either edges of nodes, or nodes directly.
+                if 'edges' in connection:
+                    yield from (edge['node'] for edge in connection['edges'])
+                else:
+                    yield from connection.get('nodes') or []
+        finally:
+            pages.close()
+
+    def process_handler(self, connector, payloads, workers, transform=None,
+                        chunksize=100, threads=1, retry_policy=None):
+        """Handling connections in worker processes, transforming results."""
+
+        # Transforms are called in workers with each payload and its result,
+        # so they must be importable functions.
+
+        # Worker processes share the rate budget, not the local limiter.
+        rate_limiter = self.rate_limiter
+        if (isinstance(rate_limiter, RateLimiter) and
+                not rate_limiter.process_safe):
+            rate_limiter = SharedRateLimiter.from_limiter(rate_limiter)
+
+        init_kwargs = {
+            key: value for key, value in self.init_kwargs.items()
+            if key not in [
+                'rate_limiter', 'response_cache', 'rate_budget_path',
+                'calls_per_hour', 'calls_per_second', 'circuit_breaker'
+            ]
+        }
+
+        # Workers trip circuits of their own, with the same settings.
+        init_kwargs['circuit_breaker'] = self.circuit_breaker
+
+        # Caches shared by processes, as in SQLite, are shared with workers.
+        cache = self.response_cache
+        if cache is not None and cache.process_safe:
+            init_kwargs['response_cache'] = cache
+
+        payloads = list(payloads)
+        shards = [payloads[index:index + chunksize]
+                  for index in range(0, len(payloads), chunksize)]
+
+        # Pools take initializers on every supported Python, 3.6 included.
+        process_pool = multiprocessing.Pool(
+            workers, initialize_process_worker,
+            (init_kwargs, self.application_details, rate_limiter))
+        try:
+            results = process_pool.starmap(
+                process_shard, [
+                    (connector, shard, threads, retry_policy, transform)
+                    for shard in shards
+                ], chunksize=1)
+
+            # Workers exiting on their own write out their queued logs.
+            process_pool.close()
+        except BaseException:
+            process_pool.terminate()
+            raise
+        finally:
+            process_pool.join()
+
+        return [result for shard in results for result in shard]
+
+    def create_async_session(self, concurrency):
+        """Creating an aiohttp session for asynchronous operations."""
+        connector = aiohttp.TCPConnector(
+            limit=concurrency, limit_per_host=concurrency)
+
+        headers = None if self.compression else {'Accept-Encoding': 'identity'}
+
+        return aiohttp.ClientSession(connector=connector, headers=headers)
+
+    async def async_process_response(self, payload, url_caller, body=None):
+        """Evaluating asynchronous responses of the Replicon API."""
+        self.setup_logging()
+        self.check_rate_limit(url_caller.status, url_caller.headers)
+
+        content = await url_caller.read()
+        wire_size = url_caller.content_length or len(content)
+        self.transfer_stats.record_response(len(content), wire_size)
+
+        return self.evaluate_response(
+            payload, url_caller.status, url_caller.headers,
+            self.codec.loads(content), body, content)
+
+    async def async_post_request(self, session, connector, headers,
+                                 payload, auth):
+        """Handling asynchronous Post Requests related to Replicon API."""
+
+        # Serializing once, for the request as well as the activity logs.
+        body, wire_body, headers = self.prepare_body(payload, headers)
+        async with session.post(
+                url=connector, headers=headers, data=wire_body, auth=auth,
+                timeout=self.async_timeout) as url_caller:
+            return await self.async_process_response(
+                payload, url_caller, body)
+
+    async def async_get_request(self, session, connector, headers,
+                                payload, auth):
+        """Handling asynchronous Get Requests related to Replicon API."""
+
+        async with session.get(
+                url=connector, headers=headers, params=payload, auth=auth,
+                timeout=self.async_timeout) as url_caller:
+            return await self.async_process_response(payload, url_caller)
+
+    async def async_connection_handler(self, connector, payload,
+                                       session=None, retry_policy=None):
+        """Handling asynchronous connections, exceptions and API limits."""
+
+        if session is None:
+            async with self.create_async_session(1) as session:
+                return await self.async_connection_handler(
+                    connector, payload, session, retry_policy)
+
+        self.setup_logging()
+        log_payload = LazyJSON(payload)
+        method, headers = self.method, self.headers
+        authentication = self.authentication()
+        if authentication:
+            authentication = aiohttp.BasicAuth(*authentication)
+
+        request = (self.async_post_request if method == 'post'
+                   else self.async_get_request)
+        retry_policy, attempt = retry_policy or self.retry_policy, 0
+
+        while True:
+            # Open circuits shed the call, instead of attempting it.
+            if self.circuit_breaker:
+                self.circuit_breaker.before_call(connector)
+
+            if self.rate_limiter:
+                await self.rate_limiter.async_acquire()
+
+            started = time.monotonic()
+            try:
+                status_code, result, failed = await request(
+                    session, connector, headers, payload, authentication)
+
+            except RepliconRateLimitError as limited:
+                # API Limits: Only the limited operation waits it out.
+                self.observe_attempt(started, True, connector)
+                self.logger.error(f'{limited} Status Code: 429.')
+                await asyncio.sleep(self.rate_limit_delay(limited))
+                continue
+
+            except Exception as exception:
+                self.observe_attempt(
+                    started, True, connector, failed=True)
+                exception_type = exception.__class__.__name__
+                exception_message = f'Exception: {exception_type} {exception}'
+                self.logger.error(
+                    'Payload: %s %s', log_payload, exception_message)
+
+                attempt += 1
+                if not retry_policy.should_retry(attempt, exception):
+                    raise
+
+                # Discovery is blocking, so it is kept off the event loop.
+                connector = await asyncio.get_event_loop().run_in_executor(
+                    None, self.refresh_connector, connector, exception)
+
+                # Attempting the failed operation again.
+                self.logger.warning(f'Exception: {exception_type}. Retrying.')
+                await asyncio.sleep(retry_policy.delay(attempt))
+                continue
+
+            overloaded = retry_policy.is_retryable(status_code=status_code)
+            self.observe_attempt(
+                started, overloaded, connector, failed=overloaded)
+
+            if overloaded:
+                self.logger.error(
+                    'Payload: %s Status: %s', log_payload, status_code)
+
+                attempt += 1
+                if retry_policy.should_retry(attempt, status_code=status_code):
+                    await asyncio.sleep(retry_policy.delay(attempt))
+                    continue
+
+            return result
+
+    async def async_bulk_handler(self, connector, payloads, concurrency,
+                                 retry_policy=None, progress=None,
+                                 progress_interval=1.0,
+                                 return_exceptions=False, adaptive=None):
+        """Handling many connections concurrently on a single event loop."""
+
+        semaphore = asyncio.Semaphore(concurrency)
+        tracker = self.progress_tracker(progress, payloads, progress_interval)
+
+        # Adaptive concurrency: Concurrency is a ceiling, slots are adapted.
+        controller = self.adaptive_concurrency(adaptive, concurrency)
+        condition = asyncio.Condition()
+
+        async def handler(session, payload):
+            try:
+                result = await self.async_connection_handler(
+                    connector, payload, session, retry_policy)
+            except Exception:
+                tracker.update(error=True)
+                raise
+
+            tracker.update()
+            return result
+
+        async def bounded_handler(session, payload):
+            if controller is None:
+                async with semaphore:
+                    return await handler(session, payload)
+
+            async with condition:
+                await condition.wait_for(controller.try_acquire)
+            try:
+                return await handler(session, payload)
+            finally:
+                controller.release()
+                async with condition:
+                    condition.notify_all()
+
+        if controller is not None:
+            self.add_attempt_observer(controller.record)
+
+        try:
+            async with self.create_async_session(concurrency) as session:
+                return await asyncio.gather(*[
+                    bounded_handler(session, payload) for payload in payloads
+                ], return_exceptions=return_exceptions)
+        finally:
+            tracker.finish()
+            if controller is not None:
+                self.remove_attempt_observer(controller.record)
+
+    def asynchronous_handler(self, connector, payloads, concurrency,
+                             retry_policy=None, progress=None,
+                             progress_interval=1.0, return_exceptions=False,
+                             adaptive=None):
+        """Running the asynchronous bulk handler from synchronous code."""
+
+        event_loop = asyncio.new_event_loop()
+        try:
+            return event_loop.run_until_complete(self.async_bulk_handler(
+                connector, payloads, concurrency, retry_policy, progress,
+                progress_interval, return_exceptions, adaptive))
+        finally:
+            event_loop.close()
+
+    def resolve_application_details(self, refresh=False):
+        """Resolving tenant details, from the discovery cache when fresh."""
+
+        details = None if refresh else self.discovery_cache.get(
+            self.company_key)
+        cached = details is not None
+
+        if details is None:
+            details = self.get_application_details()
+            self.discovery_cache.set(self.company_key, details)
+
+        self._application_details = tuple(details)
+        self.discovery_cached = cached
+        return self._application_details
+
+    def refresh_connector(self, connector, exception):
+        """Discovering the tenant again, when cached details fail."""
+
+        connection_errors = (
+            requests.ConnectionError, aiohttp.ClientConnectionError)
+        if not isinstance(exception, connection_errors):
+            return connector
+
+        cached = (self.swimlane, self.source_swimlane, self.polaris)
+
+        # Threads failing at once discover the tenant a single time; the
+        # others use the details discovered meanwhile.
+        with self._discovery_lock:
+            current = (self.swimlane, self.source_swimlane, self.polaris)
+            if self.discovery_cached and current == cached:
+                self.logger.warning(
+                    'Refreshing tenant details of %s.', self.company_key)
+                try:
+                    self.resolve_application_details(refresh=True)
+                except Exception as failure:
+                    # Failing discovery is just another failed attempt.
+                    self.logger.error(
+                        'Refreshing tenant details failed: %s %s',
+                        failure.__class__.__name__, failure)
+                    return connector
+
+            discovered = (self.swimlane, self.source_swimlane, self.polaris)
+
+        for cached_url, discovered_url in zip(cached, discovered):
+            if connector.startswith(cached_url):
+                return discovered_url + connector[len(cached_url):]
+
+        return connector
+
     def get_application_details(self):
         """Gathering Replicon Tenant Swimlane Details."""
 
@@ -230,7 +2640,7 @@ class RepliconHandler:
         tenant['companyKey'], payload['tenant'] = self.company_key, tenant
 
         # Getting swimlane information from the Company Key
-        status_code, tenant_details = self.post_request(
+        status_code, tenant_details, failed = self.post_request(
             get_tenant_details, swimlane_finder_headers, payload, None)
 
         root_urls = tenant_details['d']['applicationRootUrls']
@@ -282,3 +2692,45 @@ class RepliconHandler:
             return f'{self.swimlane}analytics/tables/{table_id}'
 
         return f'{self.swimlane}analytics/tables'
+
+
+# Handler of the worker process, instantiated by the process pool.
+process_worker_handler = None
+
+
+def initialize_process_worker(init_kwargs, application_details, rate_limiter):
+    """Instantiating the handler of a worker process."""
+
+    global process_worker_handler
+
+    handler = RepliconHandler(**dict(
+        init_kwargs, lazy=True, rate_limiter=rate_limiter))
+    handler._application_details = tuple(application_details)
+
+    # Worker processes log to files of their own.
+    handler.log_file_name = (
+        f'{handler.company_key}_log_{handler.log_time}_{os.getpid()}.log')
+    handler.log_file = rf'{handler.log_path}\{handler.log_file_name}'
+
+    process_worker_handler = handler
+
+    # Worker processes exit without running atexit functions.
+    multiprocessing.util.Finalize(None, log_router.stop, exitpriority=10)
+
+
+def process_shard(connector, payloads, threads, retry_policy, transform):
+    """Handling a shard of payloads in a worker process."""
+
+    handler = process_worker_handler
+    if threads > 1:
+        results = handler.threaded_iterator(
+            connector, payloads, threads, ordered=True,
+            retry_policy=retry_policy)
+    else:
+        results = ((payload, handler.connection_handler(
+            connector, payload, retry_policy)) for payload in payloads)
+
+    if transform is None:
+        return [result for payload, result in results]
+
+    return [transform(payload, result) for payload, result in results]